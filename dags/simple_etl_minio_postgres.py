@@ -9,7 +9,7 @@ PROJECT_ROOT = os.path.join(os.path.dirname(os.path.dirname(__file__)), "..")
 if PROJECT_ROOT not in sys.path:
     sys.path.insert(0, PROJECT_ROOT)
 
-from etl_tasks import run_etl_from_minio_to_postgres
+from etl_tasks import run_incremental_etl
 
 default_args = {
     "owner": "you",
@@ -28,7 +28,8 @@ with DAG(
     tags=["etl", "minio", "postgres"],
 ) as dag:
 
+    # loads only orders/date=YYYY-MM-DD objects not yet recorded in etl_loaded_objects
     run_etl = PythonOperator(
-        task_id="run_etl_from_minio_to_postgres",
-        python_callable=lambda: run_etl_from_minio_to_postgres("sample/orders_sample.csv"),
+        task_id="run_incremental_etl",
+        python_callable=run_incremental_etl,
     )
@@ -1,6 +1,7 @@
 import streamlit as st
 import pandas as pd
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
 import plotly.express as px
 import time
 
@@ -20,31 +21,73 @@ if st.sidebar.button('🔄 Refresh Data'):
 # Note: We use 'pg_etl' because we are inside the Docker network
 DB_URI = "postgresql+psycopg2://etl_user:etl_pass@pg_etl:5432/analytics_db"
 
-@st.cache_data(ttl=60)  # Cache data for 60 seconds
-def load_data():
-    engine = create_engine(DB_URI)
-    query = "SELECT * FROM orders_clean"
+# One engine (and connection pool) for the lifetime of the Streamlit process
+@st.cache_resource
+def get_engine():
+    return create_engine(DB_URI, pool_pre_ping=True, pool_size=4)
+
+# Aggregations run in Postgres so only a handful of rows cross the network.
+# Cache each for 60 seconds; the engine is a cached singleton, so key it by id()
+ENGINE_HASH = {Engine: id}
+
+def run_query(query, engine):
     try:
-        df = pd.read_sql(query, engine)
-        return df
+        return pd.read_sql(query, engine, dtype_backend="pyarrow")
     except Exception as e:
         st.error(f"Error connecting to database: {e}")
         return pd.DataFrame()
 
+@st.cache_data(ttl=60, hash_funcs=ENGINE_HASH)
+def load_kpis(engine):
+    return run_query("""
+        SELECT COALESCE(SUM(total_price), 0) AS total_revenue,
+               COUNT(*) AS total_orders,
+               COUNT(*) FILTER (WHERE status = 'delivered') AS delivered_orders,
+               COALESCE(AVG(total_price), 0) AS avg_order_val
+        FROM orders_clean
+    """, engine)
+
+@st.cache_data(ttl=60, hash_funcs=ENGINE_HASH)
+def load_status_agg(engine):
+    return run_query("""
+        SELECT status, SUM(total_price) AS total_price, COUNT(*) AS count
+        FROM orders_clean
+        GROUP BY status
+    """, engine)
+
+@st.cache_data(ttl=60, hash_funcs=ENGINE_HASH)
+def load_daily(engine):
+    return run_query("""
+        SELECT order_date, SUM(total_price) AS total_price
+        FROM orders_clean
+        GROUP BY 1
+        ORDER BY 1
+    """, engine)
+
+@st.cache_data(ttl=60, hash_funcs=ENGINE_HASH)
+def load_latest_orders(engine, limit=500):
+    return run_query(f"""
+        SELECT order_id, order_date, status, total_price
+        FROM orders_clean
+        ORDER BY order_id DESC
+        LIMIT {int(limit)}
+    """, engine)
+
 # --- Load Data ---
 st.title("📊 E-Commerce Sales Overview")
 st.markdown("Real-time view of data processed by Airflow pipeline")
 
-df = load_data()
+engine = get_engine()
+kpis = load_kpis(engine)
 
-if not df.empty:
+if not kpis.empty and kpis['total_orders'].iloc[0] > 0:
     # --- KPI Row ---
     col1, col2, col3, col4 = st.columns(4)
     
-    total_revenue = df['total_price'].sum()
-    total_orders = len(df)
-    delivered_orders = len(df[df['status'] == 'delivered'])
-    avg_order_val = df['total_price'].mean()
+    total_revenue = float(kpis['total_revenue'].iloc[0])
+    total_orders = int(kpis['total_orders'].iloc[0])
+    delivered_orders = int(kpis['delivered_orders'].iloc[0])
+    avg_order_val = float(kpis['avg_order_val'].iloc[0])
 
     col1.metric("Total Revenue", f"${total_revenue:,.2f}")
     col2.metric("Total Orders", total_orders)
@@ -54,14 +97,13 @@ if not df.empty:
     st.markdown("---")
 
     # --- Charts Row 1 ---
+    status_agg = load_status_agg(engine)
     col_left, col_right = st.columns(2)
 
     with col_left:
         st.subheader("Revenue by Status")
-        # Aggregation
-        status_rev = df.groupby('status')['total_price'].sum().reset_index()
         fig_status = px.bar(
-            status_rev, 
+            status_agg, 
             x='status', 
             y='total_price', 
             color='status',
@@ -72,10 +114,8 @@ if not df.empty:
 
     with col_right:
         st.subheader("Order Count by Status")
-        status_count = df['status'].value_counts().reset_index()
-        status_count.columns = ['status', 'count']
         fig_count = px.pie(
-            status_count, 
+            status_agg, 
             values='count', 
             names='status', 
             hole=0.4,
@@ -86,9 +126,9 @@ if not df.empty:
 
     # --- Charts Row 2 ---
     st.subheader("Daily Revenue Trend")
+    daily_rev = load_daily(engine)
     # Ensure date is datetime
-    df['order_date'] = pd.to_datetime(df['order_date'])
-    daily_rev = df.groupby('order_date')['total_price'].sum().reset_index()
+    daily_rev['order_date'] = pd.to_datetime(daily_rev['order_date'])
     
     fig_line = px.line(
         daily_rev, 
@@ -101,8 +141,8 @@ if not df.empty:
     st.plotly_chart(fig_line, use_container_width=True)
 
     # --- Raw Data ---
-    with st.expander("View Raw Data"):
-        st.dataframe(df.sort_values(by='order_id', ascending=False))
+    with st.expander("View Raw Data (latest 500 orders)"):
+        st.dataframe(load_latest_orders(engine))
 
 else:
     st.warning("No data found in the database yet. Run the ETL pipeline!")
\ No newline at end of file
@@ -1,22 +1,36 @@
 import os
 import io
-import csv
+import re
 import json
 import logging
+import itertools
+import functools
+import queue
+import threading
+from contextlib import closing, nullcontext
+from datetime import date
+from concurrent.futures import ThreadPoolExecutor
 import tempfile
-from typing import List, Dict
+from typing import List, Dict, Iterable, Iterator, Callable, Tuple, Union
 from dotenv import load_dotenv
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+from pyarrow import fs as pafs
 import boto3
 from botocore.client import Config
-import sqlalchemy
 from sqlalchemy import create_engine, MetaData, Table, Column
 from sqlalchemy import Integer, Float, String, Date, Boolean, Text
 from sqlalchemy import text
+from sqlalchemy.schema import CreateTable
 from sqlalchemy.exc import SQLAlchemyError
 import psycopg2
-from jsonschema import Draft7Validator
+from psycopg2.extras import execute_values
+import fastjsonschema
 
 # load env
 load_dotenv()
@@ -39,12 +53,38 @@ POSTGRES_URI = os.getenv(
 TARGET_TABLE = os.getenv("TARGET_TABLE", "orders_clean")
 UNIQUE_KEY = os.getenv("UNIQUE_KEY", "order_id")
 SCHEMA_PATH = os.getenv("SCHEMA_PATH", "schemas/orders_schema.json")
+# raw orders are partitioned as <ORDERS_PREFIX>/date=YYYY-MM-DD/*.parquet
+ORDERS_PREFIX = os.getenv("ORDERS_PREFIX", "orders")
+# partition objects (key + ETag) already loaded, per target table
+LOADED_OBJECTS_TABLE = os.getenv("LOADED_OBJECTS_TABLE", "etl_loaded_objects")
+
+# columns used downstream; Parquet reads decode only these
+REQUIRED_COLUMNS = ["order_id", "user_id", "product_id", "quantity", "price", "order_date"]
+READ_COLUMNS = REQUIRED_COLUMNS + ["status"]
+# typed layout of raw order objects; Parquet sources matching it skip row-level schema validation
+ORDERS_ARROW_SCHEMA = pa.schema([
+    ("order_id", pa.int64()),
+    ("user_id", pa.int64()),
+    ("product_id", pa.int64()),
+    ("quantity", pa.int64()),
+    ("price", pa.float64()),
+    ("order_date", pa.date32()),
+    ("status", pa.string()),
+])
+# rows per streamed batch (Parquet iter_batches / CSV chunks)
+BATCH_SIZE = int(os.getenv("BATCH_SIZE", "100000"))
+# rows serialized per CSV chunk fed to COPY
+COPY_CHUNK_ROWS = int(os.getenv("COPY_CHUNK_ROWS", "10000"))
+# loads up to this many rows skip staging and upsert straight into the target
+SMALL_LOAD_ROWS = int(os.getenv("SMALL_LOAD_ROWS", "50000"))
 
 # logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
 logger = logging.getLogger("etl")
 
 # ---------- MinIO helpers ----------
+# clients/engines are cached per process so connection pools are actually reused
+@functools.lru_cache(maxsize=1)
 def get_minio_client():
     # Ensure http/https prefix is correct
     endpoint_url = f"http{'s' if MINIO_SECURE else ''}://{MINIO_ENDPOINT}"
@@ -57,27 +97,164 @@ def get_minio_client():
         region_name="us-east-1",
     )
 
+@functools.lru_cache(maxsize=1)
+def get_minio_filesystem() -> pafs.S3FileSystem:
+    return pafs.S3FileSystem(
+        endpoint_override=MINIO_ENDPOINT,
+        scheme="https" if MINIO_SECURE else "http",
+        access_key=MINIO_ACCESS_KEY,
+        secret_key=MINIO_SECRET_KEY,
+        region="us-east-1",
+    )
+
+def iter_object_batches(key: str, batch_size: int = BATCH_SIZE) -> Iterator[pa.Table]:
+    """
+    Stream an object from MinIO as Arrow batches so memory stays O(batch).
+    Parquet objects are read row-group by row-group through pyarrow's S3 filesystem;
+    with pre_buffer the column chunks of each row group are fetched as concurrent
+    ranged GETs on pyarrow's IO thread pool. Legacy CSV objects are parsed in chunks
+    straight off the response body.
+    """
+    if key.lower().endswith(".parquet"):
+        with get_minio_filesystem().open_input_file(f"{MINIO_BUCKET}/{key}") as f:
+            pf = pq.ParquetFile(f, pre_buffer=True)
+            columns = [c for c in READ_COLUMNS if c in pf.schema_arrow.names]
+            # one reader per row group: pre_buffer holds everything it was asked to read
+            # until the reader is done, so a whole-file iter_batches would buffer the file
+            for i in range(pf.num_row_groups):
+                for batch in pf.iter_batches(batch_size=batch_size, row_groups=[i], columns=columns):
+                    yield pa.Table.from_batches([batch])
+    elif key.lower().endswith(".csv"):
+        resp = get_minio_client().get_object(Bucket=MINIO_BUCKET, Key=key)
+        # like the Parquet path, only the columns used downstream
+        with pd.read_csv(resp["Body"], chunksize=batch_size,
+                         usecols=lambda c: c.strip().lower() in READ_COLUMNS) as reader:
+            for chunk in reader:
+                yield pa.Table.from_pandas(chunk, preserve_index=False)
+    else:
+        yield pa.Table.from_pandas(download_object_as_df(key), preserve_index=False)
+
 def download_object_as_df(key: str) -> pd.DataFrame:
     s3 = get_minio_client()
     resp = s3.get_object(Bucket=MINIO_BUCKET, Key=key)
     content = resp["Body"].read()
+    # legacy CSV / JSON objects (Parquet is always streamed by iter_object_batches)
     if key.lower().endswith(".csv"):
         return pd.read_csv(io.BytesIO(content))
     else:
         return pd.read_json(io.BytesIO(content), orient="records")
 
+def read_parquet_schema(key: str) -> pa.Schema:
+    # footer only; no row groups are fetched
+    with get_minio_filesystem().open_input_file(f"{MINIO_BUCKET}/{key}") as f:
+        return pq.read_schema(f)
+
+def matches_orders_schema(schema: pa.Schema) -> bool:
+    if not set(ORDERS_ARROW_SCHEMA.names).issubset(schema.names):
+        return False
+    return pa.schema([schema.field(n) for n in ORDERS_ARROW_SCHEMA.names]).equals(ORDERS_ARROW_SCHEMA)
+
+def conform_to_orders_schema(table: pa.Table) -> pa.Table:
+    """
+    Cast known order columns to their ORDERS_ARROW_SCHEMA type where the values allow it,
+    so batches whose types were inferred separately (e.g. CSV chunks with a blank or
+    all-empty column) end up with the same schema.
+    """
+    for field in ORDERS_ARROW_SCHEMA:
+        if field.name in table.column_names and table.schema.field(field.name).type != field.type:
+            try:
+                table = table.set_column(table.column_names.index(field.name), field,
+                                         pc.cast(table[field.name], field.type))
+            except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+                pass  # left untyped; validated row by row at load time
+    return table
+
+def df_to_parquet_bytes(df) -> bytes:
+    table = pa.Table.from_pandas(df, preserve_index=False) if isinstance(df, pd.DataFrame) else df
+    # store known order columns with their typed layout where the values allow it
+    table = conform_to_orders_schema(table)
+    buf = io.BytesIO()
+    pq.write_table(table, buf, compression="snappy")
+    return buf.getvalue()
+
 def upload_sample_to_minio(local_path: str, object_key: str = None):
+    """
+    Upload a local sample file to MinIO as Snappy-compressed Parquet.
+    CSV inputs are converted; Parquet inputs are uploaded as-is.
+    """
     if object_key is None:
-        object_key = os.path.basename(local_path)
+        object_key = os.path.splitext(os.path.basename(local_path))[0] + ".parquet"
     s3 = get_minio_client()
     try:
         s3.create_bucket(Bucket=MINIO_BUCKET)
     except Exception:
         pass
-    with open(local_path, "rb") as f:
-        s3.put_object(Bucket=MINIO_BUCKET, Key=object_key, Body=f)
+    if local_path.lower().endswith(".parquet"):
+        with open(local_path, "rb") as f:
+            body = f.read()
+    else:
+        body = df_to_parquet_bytes(pd.read_csv(local_path))
+    s3.put_object(Bucket=MINIO_BUCKET, Key=object_key, Body=body)
     logger.info("Uploaded %s -> s3://%s/%s", local_path, MINIO_BUCKET, object_key)
 
+# ---------- Date partitions ----------
+PARTITION_PATTERN = re.compile(r"/date=(\d{4}-\d{2}-\d{2})/[^/]+\.parquet$")
+
+def partition_key(day: str, part: str, prefix: str = ORDERS_PREFIX) -> str:
+    return f"{prefix}/date={day}/{part}.parquet"
+
+def upload_partitioned_to_minio(local_path: str, prefix: str = ORDERS_PREFIX, part: str = None,
+                                s3=None, bucket: str = MINIO_BUCKET) -> List[str]:
+    """
+    Split a local orders file by order_date and upload one typed Parquet object per day
+    as <prefix>/date=YYYY-MM-DD/<part>.parquet. `part` defaults to the source file's
+    basename, so another file for the same day lands next to the existing objects,
+    while re-uploading the same file replaces its own. Rows without a parseable
+    order_date are skipped.
+    """
+    if part is None:
+        part = os.path.splitext(os.path.basename(local_path))[0]
+    if local_path.lower().endswith(".parquet"):
+        table = pq.read_table(local_path)
+    else:
+        table = pa.Table.from_pandas(pd.read_csv(local_path), preserve_index=False)
+    days = pc.cast(coerce_date(table["order_date"]), pa.date32())
+    table = _set_column(table, "order_date", days)
+    if days.null_count:
+        logger.warning("Skipping %d rows without a valid order_date", days.null_count)
+    s3 = s3 or get_minio_client()
+    try:
+        s3.create_bucket(Bucket=bucket)
+    except Exception:
+        pass
+    keys = []
+    for day in sorted(d for d in pc.unique(days).to_pylist() if d is not None):
+        key = partition_key(day.isoformat(), part, prefix)
+        s3.put_object(Bucket=bucket, Key=key, Body=df_to_parquet_bytes(table.filter(pc.equal(days, day))))
+        keys.append(key)
+    logger.info("Uploaded %s -> %d partitions under s3://%s/%s/", local_path, len(keys), bucket, prefix)
+    return keys
+
+def list_pending_partitions(loaded: Dict[str, str], prefix: str = ORDERS_PREFIX) -> List[Tuple[date, Dict[str, str]]]:
+    """
+    List partition objects that are new or changed since they were loaded
+    (`loaded` maps object key -> ETag), grouped by day, oldest day first, as
+    (day, {key: etag}) with each day's objects in LastModified order.
+    Only keys are listed; nothing is downloaded.
+    """
+    partitions: Dict[date, List[dict]] = {}
+    paginator = get_minio_client().get_paginator("list_objects_v2")
+    for page in paginator.paginate(Bucket=MINIO_BUCKET, Prefix=f"{prefix}/date="):
+        for obj in page.get("Contents", []):
+            match = PARTITION_PATTERN.search(obj["Key"])
+            if not match or loaded.get(obj["Key"]) == obj["ETag"]:
+                continue
+            partitions.setdefault(date.fromisoformat(match.group(1)), []).append(obj)
+    return [
+        (day, {o["Key"]: o["ETag"] for o in sorted(objs, key=lambda o: (o["LastModified"], o["Key"]))})
+        for day, objs in sorted(partitions.items())
+    ]
+
 # ---------- JSON Schema validation ----------
 def load_json_schema(path: str) -> dict:
     if not os.path.exists(path):
@@ -85,243 +262,660 @@ def load_json_schema(path: str) -> dict:
     with open(path, "r", encoding="utf-8") as f:
         return json.load(f)
 
-def validate_row_with_schema(row: Dict, schema: Dict) -> List[str]:
-    validator = Draft7Validator(schema)
-    errors = []
-    for err in validator.iter_errors(row):
-        errors.append(f"{err.message} (path: {'/'.join(map(str, err.path))})")
-    return errors
+@functools.lru_cache(maxsize=None)
+def get_schema_validator(path: str) -> Callable:
+    """Compile the JSON schema once per path; compiled validators are plain functions."""
+    return fastjsonschema.compile(load_json_schema(path))
 
-def validate_dataframe_schema(df: pd.DataFrame, schema_path: str = SCHEMA_PATH, sample_limit: int = 1000) -> List[dict]:
+def validate_row_with_schema(row: Dict, validator: Callable) -> List[str]:
+    # fastjsonschema stops at the first error
+    try:
+        validator(row)
+    except fastjsonschema.JsonSchemaValueException as err:
+        return [f"{err.message} (path: {'/'.join(map(str, err.path[1:]))})"]
+    return []
+
+JSON_TYPE_CHECKS = {
+    "integer": pa.types.is_integer,
+    "number": lambda t: pa.types.is_integer(t) or pa.types.is_floating(t),
+    "string": lambda t: pa.types.is_string(t) or pa.types.is_large_string(t),
+    "boolean": pa.types.is_boolean,
+}
+# same pattern fastjsonschema uses for "format": "date"
+DATE_FORMAT_PATTERN = r"^\d{4}-[01]\d-[0-3]\d$"
+# keywords the column-wise check understands; anything else falls back to per-row validation
+VECTORIZED_KEYWORDS = {"type", "enum", "format", "pattern", "minimum", "maximum", "title", "description"}
+
+def find_suspect_rows(table: pa.Table, schema: dict):
+    """
+    Column-wise pre-check of the JSON schema's type/enum/required/format rules.
+    Returns a boolean mask of rows that might violate the schema; rows outside
+    it are known to pass. Unsupported keywords mark a whole column as suspect.
+    """
+    all_rows = pa.array([True] * table.num_rows, type=pa.bool_())
+    if schema.get("additionalProperties", True) is not True:
+        return all_rows
+    mask = pa.array([False] * table.num_rows, type=pa.bool_())
+    required = set(schema.get("required", []))
+    for name, prop in schema.get("properties", {}).items():
+        if name not in table.column_names:
+            if name in required:
+                return all_rows
+            continue
+        col = table[name]
+        types = prop.get("type", [])
+        types = [types] if isinstance(types, str) else types
+        if set(prop) - VECTORIZED_KEYWORDS or (types and not any(
+                JSON_TYPE_CHECKS.get(t, lambda _: False)(col.type) for t in types)):
+            return all_rows
+        col_mask = pc.is_null(col) if "null" not in types else None
+        if "format" in prop and prop["format"] != "date":
+            return all_rows
+        checks = []
+        try:
+            if "enum" in prop:
+                checks.append(pc.invert(pc.is_in(col, value_set=pa.array(prop["enum"]))))
+            if "format" in prop:
+                checks.append(pc.invert(pc.match_substring_regex(col, DATE_FORMAT_PATTERN)))
+                # the pattern alone accepts e.g. month 13
+                checks.append(pc.is_null(pc.strptime(col, format="%Y-%m-%d", unit="s", error_is_null=True)))
+            if "pattern" in prop:
+                checks.append(pc.invert(pc.match_substring_regex(col, prop["pattern"])))
+            if "minimum" in prop:
+                checks.append(pc.less(col, prop["minimum"]))
+            if "maximum" in prop:
+                checks.append(pc.greater(col, prop["maximum"]))
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError, pa.ArrowTypeError):
+            # rule not expressible on this column type; let the row validator decide
+            return all_rows
+        for check in checks:
+            check = pc.fill_null(check, True)
+            col_mask = check if col_mask is None else pc.or_(col_mask, check)
+        if col_mask is not None:
+            mask = pc.or_(mask, col_mask)
+    return mask
+
+def validate_dataframe_schema(table: pa.Table, schema_path: str = SCHEMA_PATH, sample_limit: int = 1000) -> List[dict]:
+    """
+    Vectorized column checks flag suspect rows; only those (up to sample_limit)
+    are run through the compiled per-row validator.
+    """
     schema = load_json_schema(schema_path)
+    validator = get_schema_validator(schema_path)
+    # JSON has no date type: check typed date columns in their ISO string form
+    for idx, field in enumerate(table.schema):
+        if pa.types.is_date(field.type):
+            table = table.set_column(idx, field.name, pc.strftime(table[field.name], format="%Y-%m-%d"))
+    suspect = pc.indices_nonzero(find_suspect_rows(table, schema))[:sample_limit]
     msgs = []
-    for i, row in enumerate(df.to_dict(orient="records")):
-        if i >= sample_limit:
-            break
-        errors = validate_row_with_schema(row, schema)
+    for i, row in zip(suspect.to_pylist(), table.take(suspect).to_pylist()):
+        errors = validate_row_with_schema(row, validator)
         if errors:
             msgs.append({"row_index": i, "errors": errors, "row": row})
     return msgs
 
 # ---------- Transform ----------
-def transform_orders_df(df: pd.DataFrame) -> pd.DataFrame:
-    df = df.rename(columns=lambda c: c.strip().lower())
-    if "order_date" in df.columns:
-        df["order_date"] = pd.to_datetime(df["order_date"], errors="coerce")
-        def to_iso_date(val):
-            if pd.isna(val):
-                return None
-            try:
-                return val.date().isoformat()
-            except Exception:
-                return str(val)
-        df["order_date"] = df["order_date"].apply(to_iso_date)
-    if {"quantity", "price"}.issubset(df.columns):
-        df["quantity"] = pd.to_numeric(df["quantity"], errors="coerce").fillna(0).astype(int)
-        df["price"] = pd.to_numeric(df["price"], errors="coerce").fillna(0.0)
-        df["total_price"] = df["quantity"] * df["price"]
-    if UNIQUE_KEY in df.columns:
-        df = df.dropna(subset=[UNIQUE_KEY])
-    df = df.reset_index(drop=True)
-    return df
+# anything pd.to_numeric would accept as a plain decimal / float literal
+NUMERIC_PATTERN = r"^\s*[-+]?(\d+(\.\d*)?|\.\d+)([eE][-+]?\d+)?\s*$"
+
+def _is_string_type(t: pa.DataType) -> bool:
+    return pa.types.is_string(t) or pa.types.is_large_string(t)
+
+def coerce_numeric(arr, target: pa.DataType):
+    """Arrow equivalent of pd.to_numeric(errors="coerce"): unparseable strings become null."""
+    if _is_string_type(arr.type):
+        arr = pc.if_else(pc.match_substring_regex(arr, NUMERIC_PATTERN), arr, pa.scalar(None, arr.type))
+        arr = pc.cast(pc.utf8_trim_whitespace(arr), pa.float64())
+    return pc.cast(arr, target, safe=False)
+
+# pandas >= 2 infers one format per call; "mixed" restores per-value parsing
+_PANDAS_MIXED_FORMAT = int(pd.__version__.split(".")[0]) >= 2
+
+def _to_datetime(series: pd.Series, **kwargs) -> pd.Series:
+    try:
+        parsed = pd.to_datetime(series, errors="coerce", **kwargs)
+    except ValueError:
+        parsed = None  # newer pandas refuses mixed UTC offsets without utc=True
+    if parsed is None or not pd.api.types.is_datetime64_any_dtype(parsed):
+        # mixed UTC offsets: normalize them to UTC
+        parsed = pd.to_datetime(series, errors="coerce", utc=True, **kwargs)
+    return parsed.dt.tz_localize(None) if parsed.dt.tz is not None else parsed
+
+def _parse_date_values(values: pa.Array) -> pa.Array:
+    """Vectorized pd.to_datetime(errors="coerce") over a string array; failures become null."""
+    series = values.to_pandas()
+    parsed = _to_datetime(series)
+    missed = parsed.isna() & series.notna()
+    if _PANDAS_MIXED_FORMAT and missed.any():
+        # values that don't share the format inferred from the first one
+        parsed = parsed.where(~missed, _to_datetime(series[missed], format="mixed"))
+    return pc.cast(pa.Array.from_pandas(parsed), pa.timestamp("s"), safe=False)
+
+def coerce_date(arr):
+    """
+    Parse a column to timestamps; unparseable values become null.
+    ISO dates are parsed column-wise; the distinct values left over (e.g. 11/02/2025,
+    Nov 1 2025) go through one vectorized pd.to_datetime call.
+    """
+    if arr.null_count == len(arr) or not (_is_string_type(arr.type) or pa.types.is_temporal(arr.type)):
+        # e.g. an all-empty CSV chunk arrives as float64 NaN; numbers are not dates
+        return pa.nulls(len(arr), pa.timestamp("s"))
+    if not _is_string_type(arr.type):
+        return pc.cast(arr, pa.timestamp("s"), safe=False)
+    # keep the YYYY-MM-DD part of date or datetime strings
+    parsed = pc.strptime(pc.utf8_slice_codeunits(arr, 0, 10), format="%Y-%m-%d", unit="s", error_is_null=True)
+    unparsed = pc.and_(pc.is_valid(arr), pc.is_null(parsed))
+    if not pc.any(unparsed).as_py():
+        return parsed
+    values = pc.unique(pc.filter(arr, unparsed))
+    fallback = _parse_date_values(values)
+    return pc.coalesce(parsed, pc.take(fallback, pc.index_in(arr, value_set=values)))
+
+def _set_column(table: pa.Table, name: str, values) -> pa.Table:
+    if name in table.column_names:
+        return table.set_column(table.column_names.index(name), name, values)
+    return table.append_column(name, values)
+
+def transform_orders_df(table: pa.Table) -> pa.Table:
+    table = table.rename_columns([c.strip().lower() for c in table.column_names])
+    if "order_date" in table.column_names:
+        # typed date32 maps to a DATE column, so staging needs no cast afterwards
+        table = _set_column(table, "order_date", pc.cast(coerce_date(table["order_date"]), pa.date32()))
+    if {"quantity", "price"}.issubset(table.column_names):
+        quantity = pc.fill_null(coerce_numeric(table["quantity"], pa.int64()), 0)
+        price = pc.fill_null(coerce_numeric(table["price"], pa.float64()), 0.0)
+        table = _set_column(table, "quantity", quantity)
+        table = _set_column(table, "price", price)
+        table = _set_column(table, "total_price", pc.multiply(pc.cast(quantity, pa.float64()), price))
+    if UNIQUE_KEY in table.column_names:
+        table = table.filter(pc.is_valid(table[UNIQUE_KEY]))
+    # per-chunk type inference must not leak into the staging/target DDL
+    return conform_to_orders_schema(table)
 
 # ---------- DQ ----------
-REQUIRED_COLUMNS = ["order_id", "user_id", "product_id", "quantity", "price", "order_date"]
-def basic_data_quality_checks(df: pd.DataFrame, required_columns: List[str] = REQUIRED_COLUMNS) -> List[str]:
+def basic_data_quality_checks(table: pa.Table, required_columns: List[str] = REQUIRED_COLUMNS) -> List[str]:
     msgs = []
-    miss = [c for c in required_columns if c not in df.columns]
+    miss = [c for c in required_columns if c not in table.column_names]
     if miss:
         msgs.append(f"Missing required columns: {miss}")
-    if len(df) == 0:
+    if table.num_rows == 0:
         msgs.append("No rows in dataset after download/transform.")
-    if UNIQUE_KEY in df.columns and df[UNIQUE_KEY].duplicated().any():
+    if UNIQUE_KEY in table.column_names and pc.count_distinct(table[UNIQUE_KEY], mode="all").as_py() < table.num_rows:
         msgs.append("Duplicate values found in UNIQUE_KEY column.")
     return msgs
 
 # ---------- Helpers for SQL type mapping ----------
-def pandas_dtype_to_sqlalchemy(col_name: str, series: pd.Series):
-    if pd.api.types.is_integer_dtype(series):
-        return Column(col_name, Integer)
-    if pd.api.types.is_float_dtype(series):
-        return Column(col_name, Float)
-    if pd.api.types.is_bool_dtype(series):
-        return Column(col_name, Boolean)
-    if pd.api.types.is_datetime64_any_dtype(series):
-        return Column(col_name, Date)
-    # default to text/string
-    return Column(col_name, Text)
+# numpy dtype.kind -> SQL type; anything else defaults to text/string
+_KIND_TO_SA = {"i": Integer, "u": Integer, "f": Float, "b": Boolean, "M": Date, "O": Text, "U": Text}
+# Arrow type predicate -> SQL type, checked in order; anything else defaults to text
+_ARROW_TO_SA = [
+    (pa.types.is_integer, Integer),
+    (lambda t: pa.types.is_floating(t) or pa.types.is_decimal(t), Float),
+    (pa.types.is_boolean, Boolean),
+    (lambda t: pa.types.is_date(t) or pa.types.is_timestamp(t), Date),
+]
+
+def pandas_dtype_to_sqlalchemy(col_name: str, dtype):
+    """Map a pandas/numpy dtype or an Arrow type to a SQLAlchemy column."""
+    if isinstance(dtype, pa.DataType):
+        # e.g. a pandas categorical read back from Parquet as dictionary<values=string>
+        if pa.types.is_dictionary(dtype):
+            dtype = dtype.value_type
+        sa_type = next((sa for is_type, sa in _ARROW_TO_SA if is_type(dtype)), Text)
+        return Column(col_name, sa_type)
+    # pandas extension dtypes carry .kind; numpy scalar types need np.dtype()
+    kind = getattr(dtype, "kind", None) or np.dtype(dtype).kind
+    return Column(col_name, _KIND_TO_SA.get(kind, Text))
+
+def arrow_schema_to_columns(schema: pa.Schema) -> List[Column]:
+    return [pandas_dtype_to_sqlalchemy(field.name, field.type) for field in schema]
+
+def _match_schema(batch: pa.Table, schema: pa.Schema) -> pa.Table:
+    # staging/target DDL comes from the first batch; later batches must fit it
+    if batch.schema.equals(schema):
+        return batch
+    try:
+        return batch.select(schema.names).cast(schema)
+    except (KeyError, pa.ArrowInvalid, pa.ArrowNotImplementedError) as e:
+        raise ValueError(f"Batch schema does not match the first batch ({schema}): {e}") from e
 
 # ---------- DB load using COPY and upsert ----------
+@functools.lru_cache(maxsize=1)
 def get_sqlalchemy_engine():
-    return create_engine(POSTGRES_URI)
+    # pre-ping so a cached pool survives Postgres restarts between runs
+    return create_engine(POSTGRES_URI, pool_pre_ping=True)
+
+def has_unique_index(conn, table_name: str, column: str) -> bool:
+    """True if a plain (non-partial) unique index or constraint covers exactly `column`."""
+    return bool(conn.execute(text('''
+        SELECT EXISTS (
+            SELECT 1 FROM pg_index i
+            JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = i.indkey[0]
+            WHERE i.indrelid = to_regclass(:table) AND i.indisunique
+              AND i.indnatts = 1 AND i.indpred IS NULL AND a.attname = :column
+        )
+    '''), {"table": f'"{table_name}"', "column": column}).scalar())
+
+def ensure_unique_index(conn, table_name: str, unique_key: str = UNIQUE_KEY):
+    """
+    ON CONFLICT ("<unique_key>") needs a unique index to probe. Build one if the
+    target has none on that column, e.g. when it was created by an earlier ETL
+    version; a PRIMARY KEY or existing UNIQUE constraint is reused as-is.
+    """
+    if has_unique_index(conn, table_name, unique_key):
+        return
+    logger.info("Creating unique index on %s(%s)", table_name, unique_key)
+    conn.execute(text(
+        f'CREATE UNIQUE INDEX IF NOT EXISTS "{table_name}_{unique_key}_key" ON "{table_name}" ("{unique_key}");'
+    ))
 
-def create_table_if_not_exists(engine, table_name: str, df: pd.DataFrame):
+def create_table_if_not_exists(conn, table_name: str, arrow_table: pa.Table, unique_key: str = UNIQUE_KEY):
     metadata = MetaData()
-    cols = []
-    for col in df.columns:
-        cols.append(pandas_dtype_to_sqlalchemy(col, df[col]))
+    cols = arrow_schema_to_columns(arrow_table.schema)
     table = Table(table_name, metadata, *cols, extend_existing=True)
-    metadata.bind = engine
-    metadata.create_all(engine, tables=[table])
+    # one idempotent statement instead of a has_table() catalog lookup before every load
+    ddl = str(CreateTable(table).compile(dialect=conn.dialect))
+    conn.execute(text(ddl.replace("CREATE TABLE", "CREATE TABLE IF NOT EXISTS", 1)))
+    ensure_unique_index(conn, table_name, unique_key)
     return table
 
-def create_staging_table(engine, staging_name: str, df: pd.DataFrame):
-    # Drop if exists then create
-    with engine.begin() as conn:
-        conn.execute(text(f'DROP TABLE IF EXISTS "{staging_name}";'))
+def create_staging_table(conn, staging_name: str, arrow_table: pa.Table):
+    """
+    Create staging as a TEMP table that Postgres drops at COMMIT (or on rollback),
+    so it never outlives the load transaction, even when the load fails part-way.
+    TEMP tables are never WAL-logged, so COPY into staging skips WAL just like an
+    UNLOGGED table would (UNLOGGED and TEMPORARY cannot be combined in Postgres).
+    """
     metadata = MetaData()
-    cols = []
-    for col in df.columns:
-        cols.append(pandas_dtype_to_sqlalchemy(col, df[col]))
-    staging = Table(staging_name, metadata, *cols)
-    metadata.bind = engine
-    staging.create(engine)
+    cols = arrow_schema_to_columns(arrow_table.schema)
+    staging = Table(staging_name, metadata, *cols, prefixes=["TEMPORARY"], postgresql_on_commit="DROP")
+    staging.create(conn)
     return staging
 
-def copy_df_to_table_via_copy(engine, df: pd.DataFrame, table_name: str):
+class CsvChunkStream:
     """
-    Use psycopg2 COPY FROM STDIN for fast insert. Convert df to CSV in-memory.
+    Minimal file-like object over an iterator of CSV chunks, for cursor.copy_expert.
+    Only one chunk is held in memory at a time.
     """
-    # build CSV in memory
-    csv_buffer = io.StringIO()
-    df.to_csv(csv_buffer, index=False, header=True, quoting=csv.QUOTE_MINIMAL)
-    csv_buffer.seek(0)
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self._buf = b""
+        self._pos = 0
+
+    def read(self, size: int = -1) -> bytes:
+        while self._pos >= len(self._buf):
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                return b""
+            self._buf, self._pos = chunk, 0
+        end = len(self._buf) if size is None or size < 0 else self._pos + size
+        out = self._buf[self._pos:end]
+        self._pos += len(out)
+        return out
+
+def iter_csv_chunks(table: pa.Table, chunk_rows: int = COPY_CHUNK_ROWS) -> Iterator[bytes]:
+    """
+    Serialize record batches with Arrow's columnar CSV writer (no pandas round-trip).
+    One writer is specialized to the table's schema up front and reused for every
+    chunk, instead of re-resolving the per-column converters on each write_csv call.
+    """
+    sink = io.BytesIO()
+    options = pacsv.WriteOptions(include_header=False)
+    with pacsv.CSVWriter(sink, table.schema, write_options=options) as writer:
+        for batch in table.to_batches(max_chunksize=chunk_rows):
+            writer.write_batch(batch)
+            yield sink.getvalue()
+            sink.seek(0)
+            sink.truncate()
+
+def copy_df_to_table_via_copy(conn, table: pa.Table, table_name: str):
+    """
+    Use psycopg2 COPY FROM STDIN for fast insert. The table is serialized to CSV
+    COPY_CHUNK_ROWS rows at a time while COPY consumes it, so memory stays O(chunk).
+    Runs on the DBAPI connection behind `conn`, i.e. inside the caller's transaction;
+    commit/rollback is left to the caller.
+    """
+    csv_stream = CsvChunkStream(iter_csv_chunks(table))
+    cols_sql = ", ".join(f'"{c}"' for c in table.column_names)
 
-    # create a raw DBAPI connection from SQLAlchemy engine
-    raw_conn = engine.raw_connection()
-    cursor = None
+    cursor = conn.connection.cursor()
     try:
-        cursor = raw_conn.cursor()
-        sql = f'COPY "{table_name}" FROM STDIN WITH (FORMAT csv, HEADER true)'
-        cursor.copy_expert(sql, csv_buffer)
-        raw_conn.commit()
+        sql = f'COPY "{table_name}" ({cols_sql}) FROM STDIN WITH (FORMAT csv)'
+        cursor.copy_expert(sql, csv_stream)
     except Exception as e:
+        logger.exception("COPY failed: %s", e)
+        raise
+    finally:
         try:
-            raw_conn.rollback()
+            cursor.close()
         except Exception:
             pass
-        logger.exception("COPY failed: %s", e)
-        raise
+
+def _upsert_sql_parts(columns: List[str], unique_key: str):
+    cols_sql = ", ".join(f'"{c}"' for c in columns)
+    updates = ", ".join(f'"{c}" = EXCLUDED."{c}"' for c in columns if c != unique_key)
+    return cols_sql, updates
+
+def upsert_rows_via_values(conn, batches: List[pa.Table], table_name: str, unique_key: str,
+                           page_size: int = 1000) -> int:
+    """
+    Small-load path: multi-row INSERT ... ON CONFLICT DO UPDATE straight into the target
+    (psycopg2 execute_values), so rows are written once and no staging table is created.
+    """
+    cols_sql, updates = _upsert_sql_parts(batches[0].column_names, unique_key)
+    sql = f'''
+    INSERT INTO "{table_name}" ({cols_sql}) VALUES %s
+    ON CONFLICT ("{unique_key}") DO UPDATE
+    SET {updates};
+    '''
+    total = 0
+    cursor = conn.connection.cursor()
+    try:
+        for batch in batches:
+            rows = zip(*(col.to_pylist() for col in batch.columns))
+            execute_values(cursor, sql, rows, page_size=page_size)
+            total += batch.num_rows
     finally:
-        if cursor is not None:
-            try:
-                cursor.close()
-            except Exception:
-                pass
         try:
-            raw_conn.close()
+            cursor.close()
         except Exception:
             pass
+    return total
 
-def attempt_cast_date_columns(engine, staging_table: str, df: pd.DataFrame):
+def upsert_rows_via_staging(conn, batches: Iterable[pa.Table], first: pa.Table, table_name: str,
+                            unique_key: str) -> int:
     """
-    For any column name containing 'date' (case-insensitive), attempt to alter the staging column
-    to type DATE using USING column::date.
+    Large-load path: COPY every batch into a TEMP staging table, then a single
+    INSERT ... SELECT ... ON CONFLICT DO UPDATE into the target.
     """
-    date_cols = [c for c in df.columns if "date" in c.lower()]
-    if not date_cols:
-        return
-    with engine.connect() as conn:
-        for c in date_cols:
-            try:
-                logger.info("Attempting to cast staging column %s to DATE", c)
-                conn.execute(text(f'ALTER TABLE "{staging_table}" ALTER COLUMN "{c}" TYPE date USING ("{c}"::date);'))
-            except Exception as e:
-                # fetch few values to help debug
-                res = conn.execute(text(f'SELECT "{c}" FROM "{staging_table}" LIMIT 10')).fetchall()
-                sample_vals = [r[0] for r in res]
-                logger.error("Failed to cast staging column %s to date. Sample values: %s", c, sample_vals)
-                raise RuntimeError(
-                    f'Could not cast staging column "{c}" to DATE. '
-                    f'Check values and format (expected YYYY-MM-DD). Error: {e}. Sample values: {sample_vals}'
-                ) from e
-
-def load_df_to_postgres_upsert(df: pd.DataFrame, table_name: str = TARGET_TABLE, unique_key: str = UNIQUE_KEY):
-    """
-    Robust upsert:
-    1. Ensure target table exists (create if needed).
-    2. Create staging table with same columns.
-    3. Bulk insert into staging via COPY.
-    4. Attempt to cast date-like staging columns to DATE (so types match target).
-    5. INSERT INTO target SELECT FROM staging ON CONFLICT DO UPDATE...
-    6. Drop staging.
+    # create staging
+    staging_table = f"{table_name}_staging"
+    logger.info("Creating staging table %s", staging_table)
+    create_staging_table(conn, staging_table, first)
+
+    # bulk load via COPY, one batch at a time
+    total = 0
+    for batch in batches:
+        logger.info("Bulk copying %d rows into staging %s", batch.num_rows, staging_table)
+        copy_df_to_table_via_copy(conn, batch, staging_table)
+        total += batch.num_rows
+
+    # autovacuum never analyzes TEMP tables; give the planner real stats for the upsert join
+    conn.execute(text(f'ANALYZE "{staging_table}";'))
+
+    # duplicates can span batches, so check them once everything is staged
+    dupes = conn.execute(text(
+        f'SELECT COUNT(*) - COUNT(DISTINCT "{unique_key}") FROM "{staging_table}"'
+    )).scalar()
+    if dupes:
+        logger.error("Data quality issues: %s", ["Duplicate values found in UNIQUE_KEY column."])
+        raise ValueError("Data quality checks failed.")
+
+    cols_sql, updates = _upsert_sql_parts(first.column_names, unique_key)
+    upsert_sql = f'''
+    INSERT INTO "{table_name}" ({cols_sql})
+    SELECT {cols_sql} FROM "{staging_table}"
+    ON CONFLICT ("{unique_key}") DO UPDATE
+    SET {updates};
+    '''
+    conn.execute(text(upsert_sql))
+    # ON COMMIT DROP only fires at commit; drop now so another load can run in this transaction
+    conn.execute(text(f'DROP TABLE "{staging_table}";'))
+    return total
+
+def load_batches_to_postgres_upsert(batches: Iterable[pa.Table], table_name: str = TARGET_TABLE,
+                                    unique_key: str = UNIQUE_KEY, conn=None) -> int:
     """
-    engine = get_sqlalchemy_engine()
-    inspector = sqlalchemy.inspect(engine)
+    Streaming upsert, all on one connection inside a single transaction:
+    1. Ensure target table exists (create from the first batch if needed).
+    2. Buffer batches until more than SMALL_LOAD_ROWS rows have arrived.
+    3a. Small load (stream ended first): reject duplicate keys, then
+        INSERT ... VALUES ... ON CONFLICT DO UPDATE directly into the target.
+    3b. Large load: COPY everything into a TEMP staging table (dropped at commit),
+        reject duplicate keys, then
+        INSERT INTO target SELECT FROM staging ON CONFLICT DO UPDATE...
+    Any failure rolls back the whole load. Pass `conn` to run inside the caller's
+    transaction instead (e.g. to record the loaded objects atomically with the rows).
+    Returns the number of rows upserted.
+    """
+    batches = iter(batches)
     try:
-        # 1) ensure target table exists (create with inferred types if missing)
-        if not inspector.has_table(table_name):
-            logger.info("Target table %s missing — creating.", table_name)
-            # create using df.head(0) to create column structure (types inferred)
-            create_table_if_not_exists(engine, table_name, df.head(0))
-
-        # 2) create staging
-        staging_table = f"{table_name}_staging"
-        logger.info("Creating staging table %s", staging_table)
-        create_staging_table(engine, staging_table, df)
-
-        # 3) bulk load via COPY
-        logger.info("Bulk copying %d rows into staging %s", len(df), staging_table)
-        copy_df_to_table_via_copy(engine, df, staging_table)
-
-        # 4) try to cast date-like columns in staging to DATE so types align for INSERT
-        attempt_cast_date_columns(engine, staging_table, df)
-
-        # 5) upsert
-        columns = list(df.columns)
-        cols_sql = ", ".join(f'"{c}"' for c in columns)
-        updates = ", ".join(f'"{c}" = EXCLUDED."{c}"' for c in columns if c != unique_key)
-
-        upsert_sql = f'''
-        INSERT INTO "{table_name}" ({cols_sql})
-        SELECT {cols_sql} FROM "{staging_table}"
-        ON CONFLICT ("{unique_key}") DO UPDATE
-        SET {updates};
-        '''
-        with engine.begin() as conn:
-            conn.execute(text(upsert_sql))
-            conn.execute(text(f'DROP TABLE IF EXISTS "{staging_table}";'))
-
-        logger.info("Upsert complete: %d rows upserted to %s", len(df), table_name)
+        first = next(batches, None)
+        if first is None:
+            logger.warning("No batches to load into %s", table_name)
+            return 0
+
+        batches = (_match_schema(batch, first.schema) for batch in batches)
+        with nullcontext(conn) if conn is not None else get_sqlalchemy_engine().begin() as conn:
+            # 1) ensure target table exists (create with types inferred from the first batch)
+            create_table_if_not_exists(conn, table_name, first.schema.empty_table(), unique_key)
+
+            # 2) buffer just enough to know which path to take
+            head, head_rows = [first], first.num_rows
+            while head_rows <= SMALL_LOAD_ROWS:
+                batch = next(batches, None)
+                if batch is None:
+                    break
+                head.append(batch)
+                head_rows += batch.num_rows
+
+            if head_rows <= SMALL_LOAD_ROWS:
+                # 3a) small load: no staging table
+                keys = pa.chunked_array([chunk for b in head for chunk in b[unique_key].chunks],
+                                        type=first.schema.field(unique_key).type)
+                if pc.count_distinct(keys, mode="all").as_py() < len(keys):
+                    logger.error("Data quality issues: %s", ["Duplicate values found in UNIQUE_KEY column."])
+                    raise ValueError("Data quality checks failed.")
+                logger.info("Upserting %d rows directly into %s", head_rows, table_name)
+                total = upsert_rows_via_values(conn, head, table_name, unique_key)
+            else:
+                # 3b) large load: COPY through staging
+                total = upsert_rows_via_staging(conn, itertools.chain(head, batches), first,
+                                                table_name, unique_key)
+
+        logger.info("Upsert complete: %d rows upserted to %s", total, table_name)
+        return total
 
     except Exception as e:
         logger.exception("Error during upsert: %s", e)
         raise
 
+def load_df_to_postgres_upsert(df, table_name: str = TARGET_TABLE, unique_key: str = UNIQUE_KEY):
+    if isinstance(df, pd.DataFrame):
+        df = pa.Table.from_pandas(df, preserve_index=False)
+    return load_batches_to_postgres_upsert([df], table_name, unique_key)
+
+# ---------- Pipelining ----------
+_STAGE_DONE = object()
+
+class _StageError:
+    def __init__(self, exc: BaseException):
+        self.exc = exc
+
+class _StageCancelled(Exception):
+    """Raised into a stage's input when the pipeline stops, so it is not mistaken for end of input."""
+
+def _put(q: queue.Queue, item, stop: threading.Event) -> bool:
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+def _drain(q: queue.Queue, stop: threading.Event) -> Iterator:
+    while not stop.is_set():
+        try:
+            item = q.get(timeout=0.1)
+        except queue.Empty:
+            continue
+        if item is _STAGE_DONE:
+            return
+        if isinstance(item, _StageError):
+            raise item.exc
+        yield item
+    raise _StageCancelled()
+
+def _pump(items: Iterable, q: queue.Queue, stop: threading.Event):
+    try:
+        for item in items:
+            if not _put(q, item, stop):
+                return
+        _put(q, _STAGE_DONE, stop)
+    except _StageCancelled:
+        pass
+    except BaseException as e:
+        _put(q, _StageError(e), stop)
+
+def iter_pipelined(source: Iterable, *stages: Callable[[Iterator], Iterable], maxsize: int = 2) -> Iterator:
+    """
+    Run `source` and each stage (iterator -> iterator) in its own thread, connected by
+    bounded queues, and yield the last stage's output to the caller's thread. Stages
+    overlap (e.g. MinIO read / Arrow transform / COPY) while at most `maxsize` items
+    wait between any two of them. Errors in any stage are re-raised to the caller;
+    close the iterator to stop the workers early.
+    """
+    stop = threading.Event()
+    with ThreadPoolExecutor(max_workers=1 + len(stages)) as pool:
+        q = queue.Queue(maxsize=maxsize)
+        pool.submit(_pump, source, q, stop)
+        for stage in stages:
+            out = queue.Queue(maxsize=maxsize)
+            pool.submit(_pump, stage(_drain(q, stop)), out, stop)
+            q = out
+        try:
+            yield from _drain(q, stop)
+        finally:
+            stop.set()
+
+# ---------- Loaded objects ----------
+def get_loaded_objects(conn, name: str) -> Dict[str, str]:
+    conn.execute(text(f'''
+        CREATE TABLE IF NOT EXISTS "{LOADED_OBJECTS_TABLE}" (
+            name text NOT NULL,
+            object_key text NOT NULL,
+            etag text NOT NULL,
+            loaded_at timestamptz NOT NULL DEFAULT now(),
+            PRIMARY KEY (name, object_key)
+        );
+    '''))
+    rows = conn.execute(
+        text(f'SELECT object_key, etag FROM "{LOADED_OBJECTS_TABLE}" WHERE name = :name'), {"name": name}
+    )
+    return {key: etag for key, etag in rows}
+
+def mark_objects_loaded(conn, name: str, objects: Dict[str, str]):
+    conn.execute(text(f'''
+        INSERT INTO "{LOADED_OBJECTS_TABLE}" (name, object_key, etag) VALUES (:name, :key, :etag)
+        ON CONFLICT (name, object_key) DO UPDATE
+        SET etag = EXCLUDED.etag, loaded_at = now();
+    '''), [{"name": name, "key": key, "etag": etag} for key, etag in objects.items()])
+
 # ---------- Orchestrator ----------
-def run_etl_from_minio_to_postgres(object_key: str, perform_upsert: bool = True, schema_check: bool = True):
-    logger.info("Starting ETL for s3://%s/%s", MINIO_BUCKET, object_key)
-    # extract
-    df_raw = download_object_as_df(object_key)
-    logger.info("Downloaded %d raw rows", len(df_raw))
-
-    # transform
-    df_clean = transform_orders_df(df_raw)
-    logger.info("Transformed to %d rows", len(df_clean))
-
-    # DQ
-    dq = basic_data_quality_checks(df_clean)
-    if dq:
-        logger.error("Data quality issues: %s", dq)
+def clean_batches(raw_batches: Iterable[pa.Table], schema_check: bool = True,
+                  typed_source: bool = False) -> Iterator[pa.Table]:
+    """
+    Transform + DQ/schema checks, one streamed batch at a time.
+    With typed_source (the Arrow schema already matched ORDERS_ARROW_SCHEMA) only
+    null counts are checked; a batch holding nulls still gets full validation.
+    Raises ValueError as soon as a batch fails a check.
+    """
+    raw_rows = clean_rows = 0
+    for raw in raw_batches:
+        raw_rows += raw.num_rows
+        # transform
+        clean = transform_orders_df(raw)
+        if clean.num_rows == 0:
+            continue
+
+        # DQ
+        dq = basic_data_quality_checks(clean)
+        if dq:
+            logger.error("Data quality issues: %s", dq)
+            raise ValueError("Data quality checks failed.")
+
+        # schema validation (row indices are reported relative to the whole object)
+        # (a typed source already matched the schema; only nulls can still violate it)
+        needs_rows = not typed_source or any(clean[c].null_count for c in READ_COLUMNS if c in clean.column_names)
+        if schema_check and needs_rows:
+            schema_errors = validate_dataframe_schema(clean)
+            if schema_errors:
+                logger.error("Schema validation failed for %d rows (showing up to 5):", len(schema_errors))
+                for err in schema_errors[:5]:
+                    logger.error("Row %s errors: %s", clean_rows + err["row_index"], err["errors"])
+                raise ValueError("Schema validation failed.")
+
+        clean_rows += clean.num_rows
+        yield clean
+
+    logger.info("Downloaded %d raw rows, transformed to %d rows", raw_rows, clean_rows)
+    if clean_rows == 0:
+        logger.error("Data quality issues: %s", ["No rows in dataset after download/transform."])
         raise ValueError("Data quality checks failed.")
-
-    # schema validation
     if schema_check:
-        schema_errors = validate_dataframe_schema(df_clean)
-        if schema_errors:
-            logger.error("Schema validation failed for %d rows (showing up to 5):", len(schema_errors))
-            for err in schema_errors[:5]:
-                logger.error("Row %s errors: %s", err["row_index"], err["errors"])
-            raise ValueError("Schema validation failed.")
-        logger.info("Schema validation passed (sampled).")
+        logger.info("Schema validation passed (%s).", "typed Parquet source" if typed_source else "sampled per batch")
 
-    # load
-    if perform_upsert:
-        load_df_to_postgres_upsert(df_clean)
-    else:
-        # append mode: use COPY into existing table
-        engine = get_sqlalchemy_engine()
-        copy_df_to_table_via_copy(engine, df_clean, TARGET_TABLE)
-        logger.info("Appended %d rows to %s", len(df_clean), TARGET_TABLE)
+def run_etl_from_minio_to_postgres(object_key: Union[str, List[str]], perform_upsert: bool = True,
+                                   schema_check: bool = True, source_has_schema: bool = None, conn=None):
+    """
+    ETL one object (or several, streamed as one load, e.g. the files of a partition).
+    Pass `conn` to load inside the caller's transaction.
+    """
+    keys = [object_key] if isinstance(object_key, str) else list(object_key)
+    logger.info("Starting ETL for s3://%s/%s", MINIO_BUCKET, ", ".join(keys))
+    # Parquet is self-describing: if its schema already matches, skip row-level validation
+    if source_has_schema is None:
+        source_has_schema = all(k.lower().endswith(".parquet") for k in keys)
+    typed_source = schema_check and source_has_schema and all(
+        matches_orders_schema(read_parquet_schema(k)) for k in keys)
+    if source_has_schema and schema_check and not typed_source:
+        logger.info("Parquet schema differs from the expected orders schema; validating rows.")
+
+    # extract and transform run in worker threads while this thread COPYs;
+    # closing() stops the workers if the load fails part-way
+    batches = iter_pipelined(
+        itertools.chain.from_iterable(iter_object_batches(k) for k in keys),
+        lambda raw_batches: clean_batches(raw_batches, schema_check=schema_check, typed_source=typed_source),
+    )
 
-    logger.info("ETL finished successfully.")
\ No newline at end of file
+    # load
+    with closing(batches):
+        if perform_upsert:
+            load_batches_to_postgres_upsert(batches, conn=conn)
+        else:
+            # append mode: use COPY into existing table, batch by batch, in one transaction
+            total = 0
+            with nullcontext(conn) if conn is not None else get_sqlalchemy_engine().begin() as conn:
+                for batch in batches:
+                    copy_df_to_table_via_copy(conn, batch, TARGET_TABLE)
+                    total += batch.num_rows
+            logger.info("Appended %d rows to %s", total, TARGET_TABLE)
+
+    logger.info("ETL finished successfully.")
+
+def run_incremental_etl(prefix: str = ORDERS_PREFIX, schema_check: bool = True) -> int:
+    """
+    Load only the partition objects not loaded yet (or re-uploaded since), oldest day first.
+    Each day's new objects are upserted one by one in LastModified order, so a later file
+    that repeats an order_id (e.g. a status update) wins instead of failing the duplicate
+    check, and all of them are recorded as loaded in the same transaction. A failed run
+    resumes where it stopped, and files added later to an already-loaded day are picked
+    up by the next run. Returns the number of partitions loaded.
+    """
+    engine = get_sqlalchemy_engine()
+    with engine.begin() as conn:
+        loaded = get_loaded_objects(conn, TARGET_TABLE)
+    partitions = list_pending_partitions(loaded, prefix)
+    if not partitions:
+        logger.info("No new objects under s3://%s/%s/", MINIO_BUCKET, prefix)
+        return 0
+
+    logger.info("Loading %d partitions with new objects", len(partitions))
+    for day, objects in partitions:
+        with engine.begin() as conn:
+            for key in objects:
+                run_etl_from_minio_to_postgres(key, schema_check=schema_check, conn=conn)
+            mark_objects_loaded(conn, TARGET_TABLE, objects)
+        logger.info("Loaded %d new objects for %s into %s", len(objects), day, TARGET_TABLE)
+    return len(partitions)
@@ -1,13 +1,20 @@
 # scripts/init_db_and_seed.py
 import os
 import time
-import io
+import sys
 from dotenv import load_dotenv
 import sqlalchemy
 from sqlalchemy import text
 import boto3
 from botocore.client import Config
 
+# reuse the ETL's Parquet layout so seeded objects take its typed fast path
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from etl_tasks import ORDERS_PREFIX, upload_partitioned_to_minio
+
 load_dotenv()
 
 # ---------- Config (from .env or defaults) ----------
@@ -23,7 +30,6 @@ MINIO_ACCESS_KEY = os.getenv("MINIO_ACCESS_KEY", os.getenv("MINIO_ROOT_USER", "m
 MINIO_SECRET_KEY = os.getenv("MINIO_SECRET_KEY", os.getenv("MINIO_ROOT_PASSWORD", "minioadmin"))
 MINIO_BUCKET = os.getenv("MINIO_BUCKET", "raw-data")
 SAMPLE_LOCAL_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "sample_data", "orders_sample.csv")
-SAMPLE_OBJECT_KEY = "sample/orders_sample.csv"
 
 # ---------- Helpers ----------
 def wait_for_postgres(uri: str, timeout_s: int = 60):
@@ -63,18 +69,13 @@ def get_minio_client(endpoint: str, access_key: str, secret_key: str, secure: bo
         region_name="us-east-1",
     )
 
-def upload_file_to_minio(local_path: str, bucket: str, object_key: str, endpoint: str, access_key: str, secret_key: str):
+def upload_partitions_to_minio(local_path: str, bucket: str, prefix: str, endpoint: str, access_key: str, secret_key: str):
     if not os.path.exists(local_path):
         raise FileNotFoundError(f"Sample file not found: {local_path}")
     s3 = get_minio_client(endpoint, access_key, secret_key)
-    # create bucket if missing (MinIO will error if bucket exists; ignore)
-    try:
-        s3.create_bucket(Bucket=bucket)
-    except Exception:
-        pass
-    with open(local_path, "rb") as f:
-        s3.put_object(Bucket=bucket, Key=object_key, Body=f)
-    print(f"✅ Uploaded {local_path} -> s3://{bucket}/{object_key}")
+    # one Snappy Parquet object per order_date, written by the ETL's own uploader
+    keys = upload_partitioned_to_minio(local_path, prefix, s3=s3, bucket=bucket)
+    print(f"✅ Uploaded {local_path} -> {len(keys)} partitions under s3://{bucket}/{prefix}/")
 
 # ---------- Main ----------
 def main():
@@ -89,12 +90,12 @@ def main():
         print("Error creating table:", e)
         raise
 
-    # 3) Upload sample CSV to MinIO
+    # 3) Upload sample CSV to MinIO, partitioned by order_date for the incremental DAG
     try:
-        upload_file_to_minio(
+        upload_partitions_to_minio(
             SAMPLE_LOCAL_PATH,
             MINIO_BUCKET,
-            SAMPLE_OBJECT_KEY,
+            ORDERS_PREFIX,
             MINIO_ENDPOINT,
             MINIO_ACCESS_KEY,
             MINIO_SECRET_KEY,
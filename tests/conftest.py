@@ -0,0 +1,14 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+SCHEMA_FILE = os.path.join(ROOT, "schemas", "orders_schema.json")
+
+
+@pytest.fixture
+def orders_schema_path():
+    return SCHEMA_FILE
@@ -0,0 +1,42 @@
+import csv
+import io
+
+import pyarrow as pa
+
+import etl_tasks
+
+
+def test_csv_chunk_stream_reads_across_chunks():
+    stream = etl_tasks.CsvChunkStream([b"abc", b"", b"defg", b"h"])
+    out = []
+    while True:
+        piece = stream.read(3)
+        if not piece:
+            break
+        out.append(piece)
+    assert b"".join(out) == b"abcdefgh"
+    assert all(len(p) <= 3 for p in out)
+
+
+def test_csv_chunk_stream_read_all():
+    stream = etl_tasks.CsvChunkStream(iter([b"a,b\n", b"c,d\n"]))
+    assert stream.read() == b"a,b\n"
+    assert stream.read(-1) == b"c,d\n"
+    assert stream.read() == b""
+
+
+def test_iter_csv_chunks_splits_rows_and_omits_header():
+    table = pa.table({
+        "order_id": list(range(5)),
+        "status": ["a", "b,c", None, 'say "hi"', "e"],
+        "price": [1.5, 2.0, None, 3.25, 0.0],
+    })
+    chunks = list(etl_tasks.iter_csv_chunks(table, chunk_rows=2))
+    assert len(chunks) == 3
+
+    rows = list(csv.reader(io.StringIO(b"".join(chunks).decode())))
+    assert len(rows) == 5
+    assert rows[0] == ["0", "a", "1.5"]
+    assert rows[1][1] == "b,c"
+    assert rows[2][1:] == ["", ""]
+    assert rows[3][1] == 'say "hi"'
@@ -0,0 +1,190 @@
+import hashlib
+import io
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+
+import pyarrow.parquet as pq
+import pytest
+
+import etl_tasks
+
+
+class FakeS3:
+    def __init__(self):
+        self.objects = {}
+
+    def create_bucket(self, Bucket):
+        pass
+
+    def put_object(self, Bucket, Key, Body):
+        # re-inserting moves the key to the end, i.e. makes it the newest
+        self.objects.pop(Key, None)
+        self.objects[Key] = Body
+
+    def get_paginator(self, name):
+        s3 = self
+
+        class Paginator:
+            def paginate(self, Bucket, Prefix):
+                # LastModified follows insertion order; listings come back sorted by key
+                modified = {k: datetime(2025, 11, 1) + timedelta(minutes=i) for i, k in enumerate(s3.objects)}
+                yield {"Contents": [{"Key": k, "ETag": f'"{hashlib.md5(v).hexdigest()}"', "LastModified": modified[k]}
+                                    for k, v in sorted(s3.objects.items()) if k.startswith(Prefix)]}
+        return Paginator()
+
+    def rows(self, key):
+        return pq.read_table(io.BytesIO(self.objects[key])).num_rows
+
+
+@pytest.fixture
+def s3(monkeypatch):
+    fake = FakeS3()
+    monkeypatch.setattr(etl_tasks, "get_minio_client", lambda: fake)
+    return fake
+
+
+def write_csv(path, lines):
+    path.write_text("order_id,user_id,product_id,quantity,price,order_date,status\n" + "\n".join(lines) + "\n")
+    return str(path)
+
+
+def test_second_file_for_a_day_does_not_overwrite(s3, tmp_path):
+    first = write_csv(tmp_path / "orders_a.csv", ["1,1,1,1,1.0,2025-11-01,new", "2,1,1,1,1.0,2025-11-01,new"])
+    second = write_csv(tmp_path / "orders_b.csv", ["3,1,1,1,1.0,2025-11-01,new"])
+
+    assert etl_tasks.upload_partitioned_to_minio(first) == ["orders/date=2025-11-01/orders_a.parquet"]
+    etl_tasks.upload_partitioned_to_minio(second)
+    assert s3.rows("orders/date=2025-11-01/orders_a.parquet") == 2
+    assert s3.rows("orders/date=2025-11-01/orders_b.parquet") == 1
+
+    # re-uploading the same source replaces its own object
+    etl_tasks.upload_partitioned_to_minio(second)
+    assert len(s3.objects) == 2
+
+
+def test_partitions_are_typed_and_accept_legacy_dates(s3, tmp_path):
+    src = write_csv(tmp_path / "legacy.csv", [
+        "1,1,1,2,1.5,11/02/2025,new",
+        "2,1,1,1,1.0,2025-11-01,new",
+        "3,1,1,1,1.0,,new",
+    ])
+    keys = etl_tasks.upload_partitioned_to_minio(src)
+    assert keys == ["orders/date=2025-11-01/legacy.parquet", "orders/date=2025-11-02/legacy.parquet"]
+    for key in keys:
+        schema = pq.read_schema(io.BytesIO(s3.objects[key]))
+        assert etl_tasks.matches_orders_schema(schema)
+
+
+def test_list_pending_partitions(s3):
+    s3.objects = {
+        "orders/date=2025-11-02/a.parquet": b"a",
+        "orders/date=2025-11-01/a.parquet": b"b",
+        "orders/date=2025-11-01/b.parquet": b"c",
+        "orders/date=2025-11-03/notes.txt": b"d",
+    }
+    etags = {k: etag for day, objs in etl_tasks.list_pending_partitions({}) for k, etag in objs.items()}
+    assert len(etags) == 3
+
+    loaded = dict(etags)
+    del loaded["orders/date=2025-11-01/b.parquet"]
+    loaded["orders/date=2025-11-02/a.parquet"] = '"stale"'
+    pending = etl_tasks.list_pending_partitions(loaded)
+    assert [(day, sorted(objs)) for day, objs in pending] == [
+        (date(2025, 11, 1), ["orders/date=2025-11-01/b.parquet"]),
+        (date(2025, 11, 2), ["orders/date=2025-11-02/a.parquet"]),
+    ]
+
+
+@pytest.fixture
+def state(monkeypatch):
+    """In-memory loaded-object table and a recording run_etl_from_minio_to_postgres."""
+    recorded, runs = {}, []
+
+    class Engine:
+        @contextmanager
+        def begin(self):
+            yield object()
+
+    def run_etl(key, schema_check=True, conn=None):
+        if "fail" in key:
+            raise ValueError("Data quality checks failed.")
+        runs.append(key)
+
+    monkeypatch.setattr(etl_tasks, "get_sqlalchemy_engine", lambda: Engine())
+    monkeypatch.setattr(etl_tasks, "get_loaded_objects", lambda conn, name: dict(recorded))
+    monkeypatch.setattr(etl_tasks, "mark_objects_loaded", lambda conn, name, objects: recorded.update(objects))
+    monkeypatch.setattr(etl_tasks, "run_etl_from_minio_to_postgres", run_etl)
+    return runs
+
+
+def test_incremental_etl_picks_up_late_files(s3, state):
+    s3.objects = {
+        "orders/date=2025-11-01/a.parquet": b"a",
+        "orders/date=2025-11-02/a.parquet": b"b",
+    }
+    assert etl_tasks.run_incremental_etl() == 2
+    assert state == ["orders/date=2025-11-01/a.parquet", "orders/date=2025-11-02/a.parquet"]
+
+    assert etl_tasks.run_incremental_etl() == 0
+
+    # a late file for a day that was already loaded
+    s3.objects["orders/date=2025-11-01/b.parquet"] = b"c"
+    assert etl_tasks.run_incremental_etl() == 1
+    assert state[-1] == "orders/date=2025-11-01/b.parquet"
+
+
+def test_incremental_etl_retries_failed_partition(s3, state):
+    s3.objects = {
+        "orders/date=2025-11-01/a.parquet": b"a",
+        "orders/date=2025-11-02/fail.parquet": b"b",
+    }
+    with pytest.raises(ValueError):
+        etl_tasks.run_incremental_etl()
+    assert state == ["orders/date=2025-11-01/a.parquet"]
+
+    del s3.objects["orders/date=2025-11-02/fail.parquet"]
+    s3.objects["orders/date=2025-11-02/ok.parquet"] = b"fixed"
+    assert etl_tasks.run_incremental_etl() == 1
+    assert state[-1] == "orders/date=2025-11-02/ok.parquet"
+
+
+def test_objects_of_a_day_load_in_last_modified_order(s3, state):
+    # "a" is uploaded after "b", so it is the newer file despite its name
+    s3.objects = {
+        "orders/date=2025-11-01/b.parquet": b"b",
+        "orders/date=2025-11-01/a.parquet": b"a",
+    }
+    assert etl_tasks.run_incremental_etl() == 1
+    assert state == ["orders/date=2025-11-01/b.parquet", "orders/date=2025-11-01/a.parquet"]
+
+
+def test_overlapping_order_ids_across_files_of_a_day(s3, monkeypatch, tmp_path):
+    """Two pending files repeat an order_id: each is upserted on its own, newest last."""
+    upserts, recorded = [], {}
+
+    class Engine:
+        @contextmanager
+        def begin(self):
+            yield object()
+
+    def via_values(conn, batches, table_name, unique_key):
+        upserts.append([row for b in batches for row in zip(b["order_id"].to_pylist(), b["status"].to_pylist())])
+        return sum(b.num_rows for b in batches)
+
+    monkeypatch.setattr(etl_tasks, "get_sqlalchemy_engine", lambda: Engine())
+    monkeypatch.setattr(etl_tasks, "get_loaded_objects", lambda conn, name: dict(recorded))
+    monkeypatch.setattr(etl_tasks, "mark_objects_loaded", lambda conn, name, objects: recorded.update(objects))
+    monkeypatch.setattr(etl_tasks, "read_parquet_schema", lambda key: pq.read_schema(io.BytesIO(s3.objects[key])))
+    monkeypatch.setattr(etl_tasks, "iter_object_batches",
+                        lambda key: iter([pq.read_table(io.BytesIO(s3.objects[key]))]))
+    monkeypatch.setattr(etl_tasks, "create_table_if_not_exists", lambda *a, **k: None)
+    monkeypatch.setattr(etl_tasks, "upsert_rows_via_values", via_values)
+
+    etl_tasks.upload_partitioned_to_minio(write_csv(tmp_path / "orders.csv", [
+        "1,1,1,1,1.0,2025-11-01,pending", "2,1,1,1,1.0,2025-11-01,pending"]))
+    etl_tasks.upload_partitioned_to_minio(write_csv(tmp_path / "updates.csv", [
+        "1,1,1,1,1.0,2025-11-01,delivered"]))
+
+    assert etl_tasks.run_incremental_etl() == 1
+    assert upserts == [[(1, "pending"), (2, "pending")], [(1, "delivered")]]
+    assert sorted(recorded) == ["orders/date=2025-11-01/orders.parquet", "orders/date=2025-11-01/updates.parquet"]
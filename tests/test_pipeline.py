@@ -0,0 +1,66 @@
+import threading
+import time
+
+import pytest
+
+import etl_tasks
+
+
+def double(items):
+    for item in items:
+        yield item * 2
+
+
+def test_iter_pipelined_preserves_order():
+    assert list(etl_tasks.iter_pipelined(range(20), double, double, maxsize=1)) == [i * 4 for i in range(20)]
+
+
+def test_iter_pipelined_reraises_stage_error():
+    def boom(items):
+        for item in items:
+            if item == 3:
+                raise ValueError("bad batch")
+            yield item
+
+    with pytest.raises(ValueError, match="bad batch"):
+        list(etl_tasks.iter_pipelined(range(10), boom))
+
+
+def test_iter_pipelined_reraises_source_error():
+    def source():
+        yield 1
+        raise RuntimeError("read failed")
+
+    with pytest.raises(RuntimeError, match="read failed"):
+        list(etl_tasks.iter_pipelined(source(), double))
+
+
+def test_iter_pipelined_close_stops_workers():
+    before = threading.active_count()
+    it = etl_tasks.iter_pipelined(iter(range(10 ** 9)), double)
+    assert next(it) == 0
+    it.close()
+    assert threading.active_count() <= before
+
+
+def test_iter_pipelined_cancel_is_not_end_of_input():
+    seen = []
+
+    def stage(items):
+        count = 0
+        for item in items:
+            count += 1
+            yield item
+        # only reached if cancellation looked like a normal end of input
+        seen.append(count)
+
+    def slow_source():
+        yield 0
+        # keep the stage waiting on its input while the caller closes the pipeline
+        time.sleep(0.5)
+        yield 1
+
+    it = etl_tasks.iter_pipelined(slow_source(), stage)
+    assert next(it) == 0
+    it.close()
+    assert seen == []
@@ -0,0 +1,91 @@
+import io
+from datetime import date, datetime
+
+import pandas as pd
+import pyarrow as pa
+
+import etl_tasks
+
+
+def test_coerce_date_parses_iso_and_legacy_formats():
+    arr = pa.chunked_array([pa.array([
+        "2025-11-01", "2025-11-03T10:00:00", "11/02/2025", "2025/11/01", "Nov 1 2025",
+        "2025-13-01", "junk", None,
+    ])])
+    assert etl_tasks.coerce_date(arr).to_pylist() == [
+        datetime(2025, 11, 1), datetime(2025, 11, 3), datetime(2025, 11, 2), datetime(2025, 11, 1),
+        datetime(2025, 11, 1), None, None, None,
+    ]
+
+
+def test_coerce_date_matches_pandas_per_value():
+    values = ["2025-11-01", "11/02/2025", "Nov 1 2025", "not a date", None]
+    expected = [None if pd.isna(v) else v.to_pydatetime()
+                for v in (pd.to_datetime(x, errors="coerce") for x in values)]
+    assert etl_tasks.coerce_date(pa.array(values)).to_pylist() == expected
+
+
+def test_coerce_date_all_empty_csv_chunk():
+    # pandas reads an all-empty column as float64 NaN
+    chunk = pd.read_csv(io.StringIO("order_id,order_date\n1,\n2,\n"))
+    table = pa.Table.from_pandas(chunk, preserve_index=False)
+    assert table.schema.field("order_date").type == pa.float64()
+
+    out = etl_tasks.coerce_date(table["order_date"])
+    assert out.type == pa.timestamp("s")
+    assert out.to_pylist() == [None, None]
+
+
+def test_coerce_date_null_typed_column():
+    assert etl_tasks.coerce_date(pa.nulls(3)).to_pylist() == [None, None, None]
+
+
+def test_transform_orders_df_keeps_legacy_dates():
+    table = pa.table({
+        "Order_ID": [1, 2, None],
+        "order_date": ["11/02/2025", "2025-11-01", "2025-11-01"],
+        "quantity": ["2", "x", "1"],
+        "price": [1.5, 2.0, 3.0],
+    })
+    out = etl_tasks.transform_orders_df(table)
+    assert out["order_id"].to_pylist() == [1, 2]
+    assert out.schema.field("order_date").type == pa.date32()
+    assert out["order_date"].to_pylist() == [date(2025, 11, 2), date(2025, 11, 1)]
+    assert out["quantity"].to_pylist() == [2, 0]
+    assert out["total_price"].to_pylist() == [3.0, 0.0]
+
+
+def test_coerce_date_fallback_is_vectorized(monkeypatch):
+    calls = []
+    to_datetime = pd.to_datetime
+
+    def counting(*args, **kwargs):
+        calls.append(args)
+        return to_datetime(*args, **kwargs)
+
+    monkeypatch.setattr(pd, "to_datetime", counting)
+    values = [f"{m:02d}/{d:02d}/2025 10:{d:02d}:00" for m in range(1, 13) for d in range(1, 29)]
+    out = etl_tasks.coerce_date(pa.array(values + ["Nov 1 2025", "junk"]))
+    assert out.null_count == 1
+    assert out[0].as_py() == datetime(2025, 1, 1, 10, 1)
+    # one call for the inferred format, at most one more for the leftovers
+    assert len(calls) <= 2
+
+
+def test_csv_chunks_transform_to_one_schema():
+    # a blank order_id or an all-empty column changes pandas' inferred dtype per chunk
+    csv = io.StringIO(
+        "order_id,user_id,product_id,quantity,price,order_date,status\n"
+        "1,1,1,1,1.0,2025-11-01,\n"
+        "2,1,1,1,1.0,2025-11-01,\n"
+        ",1,1,1,1.0,2025-11-01,x\n"
+        "4,,1,1,1.0,,y\n"
+    )
+    with pd.read_csv(csv, chunksize=2) as reader:
+        raw = [pa.Table.from_pandas(chunk, preserve_index=False) for chunk in reader]
+    assert not raw[0].schema.equals(raw[1].schema)
+
+    clean = [etl_tasks.transform_orders_df(t) for t in raw]
+    assert clean[0].schema.equals(clean[1].schema)
+    assert clean[0].schema.field("order_id").type == pa.int64()
+    assert clean[0].schema.field("status").type == pa.string()
@@ -0,0 +1,130 @@
+import io
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from sqlalchemy.dialects import postgresql
+
+import etl_tasks
+
+
+@pytest.fixture
+def paths(monkeypatch):
+    calls = {}
+
+    def via_values(conn, batches, table_name, unique_key):
+        calls["values"] = sum(b.num_rows for b in batches)
+        return calls["values"]
+
+    def via_staging(conn, batches, first, table_name, unique_key):
+        calls["staging"] = sum(b.num_rows for b in batches)
+        return calls["staging"]
+
+    monkeypatch.setattr(etl_tasks, "create_table_if_not_exists", lambda *a, **k: None)
+    monkeypatch.setattr(etl_tasks, "upsert_rows_via_values", via_values)
+    monkeypatch.setattr(etl_tasks, "upsert_rows_via_staging", via_staging)
+    monkeypatch.setattr(etl_tasks, "SMALL_LOAD_ROWS", 10)
+    return calls
+
+
+def batches(*sizes):
+    start = 0
+    for size in sizes:
+        yield pa.table({"order_id": list(range(start, start + size))})
+        start += size
+
+
+def test_small_load_skips_staging(paths):
+    assert etl_tasks.load_batches_to_postgres_upsert(batches(4, 6), conn=object()) == 10
+    assert paths == {"values": 10}
+
+
+def test_large_load_uses_staging(paths):
+    assert etl_tasks.load_batches_to_postgres_upsert(batches(4, 6, 1, 5), conn=object()) == 16
+    assert paths == {"staging": 16}
+
+
+def test_small_load_rejects_duplicate_keys(paths):
+    dupes = [pa.table({"order_id": [1, 2]}), pa.table({"order_id": [2, 3]})]
+    with pytest.raises(ValueError, match="Data quality"):
+        etl_tasks.load_batches_to_postgres_upsert(dupes, conn=object())
+    assert paths == {}
+
+
+def test_empty_load(paths):
+    assert etl_tasks.load_batches_to_postgres_upsert(iter([]), conn=object()) == 0
+    assert paths == {}
+
+
+class FakeConn:
+    def __init__(self, has_index):
+        self.dialect = postgresql.dialect()
+        self.has_index = has_index
+        self.statements = []
+
+    def execute(self, statement, params=None):
+        sql = str(statement)
+        self.statements.append(sql)
+
+        class Result:
+            def scalar(_):
+                return self.has_index
+        return Result()
+
+
+@pytest.mark.parametrize("has_index", [False, True])
+def test_create_table_ensures_unique_index(has_index):
+    conn = FakeConn(has_index)
+    etl_tasks.create_table_if_not_exists(conn, "orders_clean", pa.table({"order_id": [1], "price": [1.0]}))
+    assert conn.statements[0].startswith("\nCREATE TABLE IF NOT EXISTS orders_clean")
+    assert "pg_index" in conn.statements[1]
+    created = [s for s in conn.statements if s.startswith("CREATE UNIQUE INDEX")]
+    if has_index:
+        assert created == []
+    else:
+        assert created == ['CREATE UNIQUE INDEX IF NOT EXISTS "orders_clean_order_id_key" ON "orders_clean" ("order_id");']
+
+
+def test_later_batches_are_cast_to_the_first_schema(paths):
+    mixed = [
+        pa.table({"order_id": [1, 2], "status": pa.array([None, None], pa.string())}),
+        pa.table({"status": ["x", "y"], "order_id": pa.array([3.0, 4.0])}),
+    ]
+    assert etl_tasks.load_batches_to_postgres_upsert(mixed, conn=object()) == 4
+    assert paths == {"values": 4}
+
+
+def test_incompatible_batch_schema_is_rejected(paths):
+    mixed = [pa.table({"order_id": [1, 2]}), pa.table({"order_id": ["a", "b"]})]
+    with pytest.raises(ValueError, match="first batch"):
+        etl_tasks.load_batches_to_postgres_upsert(mixed, conn=object())
+
+
+@pytest.mark.parametrize("arrow_type, sa_name", [
+    (pa.int64(), "INTEGER"),
+    (pa.uint8(), "INTEGER"),
+    (pa.float32(), "FLOAT"),
+    (pa.bool_(), "BOOLEAN"),
+    (pa.date32(), "DATE"),
+    (pa.timestamp("us", tz="UTC"), "DATE"),
+    (pa.string(), "TEXT"),
+    (pa.large_string(), "TEXT"),
+    (pa.dictionary(pa.int8(), pa.string()), "TEXT"),
+    (pa.dictionary(pa.int32(), pa.int64()), "INTEGER"),
+])
+def test_arrow_type_to_sql(arrow_type, sa_name):
+    column = etl_tasks.pandas_dtype_to_sqlalchemy("c", arrow_type)
+    assert column.type.compile(dialect=postgresql.dialect()) == sa_name
+
+
+def test_categorical_parquet_column_creates_text_column():
+    df = pd.DataFrame({"order_id": [1, 2], "status": pd.Categorical(["new", "shipped"])})
+    buf = io.BytesIO()
+    df.to_parquet(buf)
+    schema = pq.read_schema(io.BytesIO(buf.getvalue()))
+    assert pa.types.is_dictionary(schema.field("status").type)
+
+    conn = FakeConn(has_index=True)
+    etl_tasks.create_table_if_not_exists(conn, "orders_clean", schema.empty_table())
+    assert "status TEXT" in conn.statements[0]
@@ -0,0 +1,95 @@
+import pyarrow as pa
+import pytest
+
+import etl_tasks
+
+
+def per_row_failures(table, schema_path):
+    validator = etl_tasks.get_schema_validator(schema_path)
+    return [i for i, row in enumerate(table.to_pylist())
+            if etl_tasks.validate_row_with_schema(row, validator)]
+
+
+def orders(**overrides):
+    cols = {
+        "order_id": [1, 2, 3, 4],
+        "user_id": [10, 11, 12, 13],
+        "product_id": [100, 101, 102, 103],
+        "quantity": [1, 2, 3, 4],
+        "price": [9.5, 1.0, 2.25, 4.0],
+        "order_date": ["2025-11-01", "2025-11-02", "2025-11-03", "2025-11-04"],
+        "status": ["delivered", "pending", "shipped", "cancelled"],
+    }
+    cols.update(overrides)
+    return pa.table(cols)
+
+
+CASES = {
+    "clean": orders(),
+    "null_string_key": orders(product_id=["a", "b", None, "d"]),
+    "bad_dates": orders(order_date=["2025-11-01", "2025-13-01", "11/02/2025", None]),
+    "null_status": orders(status=["delivered", None, "shipped", None]),
+    "string_price": orders(price=["1.0", "x", "2", "3"]),
+    "missing_required": orders().drop_columns(["status"]),
+    "extra_column": orders().append_column("note", pa.array(["a", None, "c", "d"])),
+}
+
+
+@pytest.mark.parametrize("name", sorted(CASES))
+def test_vectorized_matches_per_row(name, orders_schema_path):
+    table = CASES[name]
+    expected = per_row_failures(table, orders_schema_path)
+
+    schema = etl_tasks.load_json_schema(orders_schema_path)
+    suspect = etl_tasks.find_suspect_rows(table, schema).to_pylist()
+    # the pre-check may over-flag, but must never miss a failing row
+    assert all(suspect[i] for i in expected)
+
+    errors = etl_tasks.validate_dataframe_schema(table, schema_path=orders_schema_path)
+    assert [e["row_index"] for e in errors] == expected
+
+
+def test_clean_rows_are_not_suspect(orders_schema_path):
+    schema = etl_tasks.load_json_schema(orders_schema_path)
+    assert not any(etl_tasks.find_suspect_rows(CASES["clean"], schema).to_pylist())
+
+
+def test_typed_dates_are_validated_as_iso_strings(orders_schema_path):
+    table = etl_tasks.transform_orders_df(orders())
+    assert pa.types.is_date32(table.schema.field("order_date").type)
+    assert etl_tasks.validate_dataframe_schema(table, schema_path=orders_schema_path) == []
+
+
+@pytest.fixture
+def validated(monkeypatch):
+    calls = []
+
+    def validate(table, *args, **kwargs):
+        calls.append(table.num_rows)
+        return []
+
+    monkeypatch.setattr(etl_tasks, "validate_dataframe_schema", validate)
+    return calls
+
+
+def typed_orders(**overrides):
+    # the raw layout of a Parquet source that matched ORDERS_ARROW_SCHEMA
+    return orders(**overrides).cast(etl_tasks.ORDERS_ARROW_SCHEMA)
+
+
+def test_typed_source_skips_validation_without_nulls(validated):
+    raw = [typed_orders(), typed_orders(order_id=[5, 6, 7, 8])]
+    out = list(etl_tasks.clean_batches(raw, schema_check=True, typed_source=True))
+    assert sum(t.num_rows for t in out) == 8
+    assert validated == []
+
+
+def test_typed_source_validates_batches_with_nulls(validated):
+    raw = [typed_orders(), typed_orders(order_id=[5, 6, 7, 8], status=["a", None, "c", "d"])]
+    list(etl_tasks.clean_batches(raw, schema_check=True, typed_source=True))
+    assert validated == [4]
+
+
+def test_untyped_source_validates_every_batch(validated):
+    list(etl_tasks.clean_batches([orders(), orders(order_id=[5, 6, 7, 8])], schema_check=True))
+    assert validated == [4, 4]